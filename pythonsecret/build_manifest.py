@@ -1,42 +1,58 @@
 import json
-import hashlib
+import os
 import tempfile
 import zipfile
-import os
 import requests
-import base64
+from contextlib import closing
+from pathlib import Path
 
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib encoder produces the same bytes
+    orjson = None
+
+from create_manifest import load_private_key, sign_manifest, write_manifest
+from validate_payload import hash_zip_members, normalize_many
 
 
 UPDATE_JSON_URL = "https://github.com/bugtesterdani/C--Installer-without-Admin/releases/latest/download/update.json"
 PRIVATE_KEY_PATH = "private.pem"
 OUTPUT_MANIFEST = "manifest.json"
+DOWNLOAD_CHUNK_SIZE = 1 << 20
 
-
-def sha256_file(path):
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        h.update(f.read())
-    return h.hexdigest()
+# Eine Session für alle Requests: update.json und ZIP nutzen dieselbe Verbindung (Keep-Alive)
+session = requests.Session()
 
 
 def download_file(url, target_path):
     print(f"Lade ZIP herunter: {url}")
-    r = requests.get(url)
-    r.raise_for_status()
-    with open(target_path, "wb") as f:
-        f.write(r.content)
-
-
-def load_private_key():
-    with open(PRIVATE_KEY_PATH, "rb") as f:
-        return serialization.load_pem_private_key(f.read(), password=None)
+    with session.get(url, stream=True, timeout=(5, 60)) as r:
+        r.raise_for_status()
+        with open(target_path, "wb") as f:
+            for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+
+
+# Hasht die Dateien direkt aus dem ZIP, ohne es zu entpacken
+def hash_zip(zip_path):
+    with zipfile.ZipFile(zip_path, "r") as archive:
+        infos = [info for info in archive.infolist() if not info.is_dir()]
+        names = normalize_many([info.filename for info in infos])
+        # Wie validate_payload.index_zip_members: doppelte Namen nach der Normalisierung ablehnen
+        seen = set()
+        for name in names:
+            if name in seen:
+                raise ValueError(f"Doppelte Datei im ZIP: {name}")
+            seen.add(name)
+        # Ohne erwartete Hashes muss zipfile die CRC-32 prüfen: kein STORED-Fast-Path
+        with closing(hash_zip_members(archive, infos, stored_fast_path=False)) as digests:
+            return {name: digest.hex() for name, digest in zip(names, digests)}
 
 
 # 🔥 WICHTIG: Python & C# müssen EXAKT dieselben Bytes erzeugen
 def canonical_json(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
     return json.dumps(
         obj,
         sort_keys=True,
@@ -46,32 +62,27 @@ def canonical_json(obj):
 
 
 def main():
+    # Schlüssel zuerst laden: ein fehlender oder defekter Schlüssel fällt vor dem Download auf
+    private_key = load_private_key(Path(PRIVATE_KEY_PATH))
+
     print("Lade update.json...")
-    update_info = requests.get(UPDATE_JSON_URL).json()
+    r = session.get(UPDATE_JSON_URL, timeout=(5, 60))
+    r.raise_for_status()
+    update_info = r.json()
 
     version = update_info["Version"]
     zip_url = update_info["Url"]
 
     # ZIP herunterladen
     temp_zip = tempfile.NamedTemporaryFile(delete=False).name
-    download_file(zip_url, temp_zip)
-
-    # ZIP entpacken
-    temp_dir = tempfile.mkdtemp()
-    print(f"Entpacke ZIP nach: {temp_dir}")
+    try:
+        download_file(zip_url, temp_zip)
 
-    with zipfile.ZipFile(temp_zip, "r") as zip_ref:
-        zip_ref.extractall(temp_dir)
-
-    # Hashes erzeugen
-    print("Erzeuge Datei-Hashes...")
-    files = {}
-
-    for root, dirs, filenames in os.walk(temp_dir):
-        for name in filenames:
-            full = os.path.join(root, name)
-            rel = os.path.relpath(full, temp_dir)
-            files[rel.replace("\\", "/")] = sha256_file(full)
+        # Hashes erzeugen
+        print("Erzeuge Datei-Hashes...")
+        files = hash_zip(temp_zip)
+    finally:
+        os.unlink(temp_zip)
 
     # Manifest ohne Signatur
     manifest_unsigned = {
@@ -84,19 +95,10 @@ def main():
 
     # Signieren
     print("Signiere Manifest...")
-    private_key = load_private_key()
-    signature = private_key.sign(
-        manifest_bytes,
-        padding.PKCS1v15(),
-        hashes.SHA256()
-    )
-
-    manifest = manifest_unsigned.copy()
-    manifest["signature"] = base64.b64encode(signature).decode()
-
-    # Speichern
-    with open(OUTPUT_MANIFEST, "w", encoding="utf-8") as f:
-        json.dump(manifest, f, indent=4, ensure_ascii=False)
+    signature = sign_manifest(private_key, manifest_bytes)
+
+    # Speichern (Signatur wird an die kanonischen Bytes angehängt)
+    write_manifest(Path(OUTPUT_MANIFEST), manifest_bytes, signature)
 
     print(f"manifest.json erzeugt: {OUTPUT_MANIFEST}")
 
@@ -5,23 +5,40 @@ The generated manifest matches the structure expected by the launchers:
 {
     "version": "<semantic version>",
     "files": { "<relative path>": "<sha256 hex>" },
-    "signature": "<base64 RSA signature>"
+    "signature": "<base64 RSA or Ed25519 signature>"
 }
+
+The signature algorithm follows the type of the private key. The WPF launcher
+only verifies RSA PKCS#1 v1.5, so Ed25519 keys are for tooling that supports it.
 """
 
 import argparse
 import base64
+import functools
 import hashlib
 import json
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib encoder produces the same bytes
+    orjson = None
 
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric import ed25519, padding
+
+HASH_CHUNK_SIZE = 1 << 20  # 1 MiB per read keeps the per-call overhead negligible
+SHA256_HEX = re.compile(r"[0-9a-f]{64}")
 
 
 def canonical_json(obj) -> bytes:
     """Return canonical JSON bytes compatible with the C# verifier."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
     return json.dumps(
         obj,
         sort_keys=True,
@@ -30,36 +47,131 @@ def canonical_json(obj) -> bytes:
     ).encode("utf-8")
 
 
-def sha256_file(path: Path) -> str:
+def sha256_file(path: str) -> str:
     """Calculate a SHA-256 hex digest for a single file."""
-    hasher = hashlib.sha256()
-    with path.open("rb") as f:
-        while chunk := f.read(8192):
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: streaming loop runs in C
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        hasher = hashlib.sha256()
+        while chunk := f.read(HASH_CHUNK_SIZE):
             hasher.update(chunk)
-    return hasher.hexdigest()
+        return hasher.hexdigest()
+
 
+def collect_hashes(payload_dir: Path, cache: Optional[dict[str, list]] = None) -> dict[str, str]:
+    """
+    Recursively hash all files under the payload directory and return a relative-path map.
 
-def collect_hashes(payload_dir: Path) -> dict[str, str]:
-    """Recursively hash all files under the payload directory and return a relative-path map."""
+    The tree is walked with os.scandir so each entry is stat()ed at most once,
+    and files are hashed on a thread pool; hashlib releases the GIL while
+    digesting, so this spreads the work across all cores.
+
+    If a cache (relative path -> [size, mtime_ns, sha256]) is given, files whose
+    size and mtime are unchanged reuse the cached digest, and the cache is
+    updated in place to describe the current payload.
+    """
     files: dict[str, str] = {}
-    for file_path in payload_dir.rglob("*"):
-        if file_path.is_file():
-            rel = file_path.relative_to(payload_dir).as_posix()
-            files[rel] = sha256_file(file_path)
+    stats: dict[str, list] = {}
+    rel_paths: list[str] = []
+    file_paths: list[str] = []
+    stack: list[tuple[str, tuple[str, ...]]] = [(os.fspath(payload_dir), ())]
+    while stack:
+        base, prefix = stack.pop()
+        with os.scandir(base) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, prefix + (entry.name,)))
+                elif entry.is_file():
+                    rel = "/".join(prefix + (entry.name,))
+                    if cache is not None:
+                        stat = entry.stat()
+                        stats[rel] = [stat.st_size, stat.st_mtime_ns]
+                        cached = cache.get(rel)
+                        if cached and cached[:2] == stats[rel]:
+                            files[rel] = cached[2]
+                            continue
+                    rel_paths.append(rel)
+                    file_paths.append(entry.path)
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        files.update(zip(rel_paths, executor.map(sha256_file, file_paths)))
+
+    if cache is not None:
+        cache.clear()
+        cache.update({rel: stat + [files[rel]] for rel, stat in stats.items()})
     return files
 
 
-def load_private_key(private_key: Path):
-    """Load a PEM-encoded RSA private key for signing."""
-    with private_key.open("rb") as f:
+def load_hash_cache(cache_path: Path, payload_dir: Path) -> dict[str, list]:
+    """
+    Load a hash cache for the payload; missing, unreadable or foreign caches start
+    empty, and entries that are not [size, mtime_ns, sha256 hex] are dropped.
+    """
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("payload_dir") != os.path.abspath(payload_dir):
+        return {}
+    files = data.get("files")
+    if not isinstance(files, dict):
+        return {}
+    return {
+        rel: entry
+        for rel, entry in files.items()
+        if isinstance(entry, list)
+        and len(entry) == 3
+        and all(type(value) is int for value in entry[:2])
+        and isinstance(entry[2], str)
+        and SHA256_HEX.fullmatch(entry[2])
+    }
+
+
+def save_hash_cache(cache_path: Path, payload_dir: Path, cache: dict[str, list]):
+    """Persist the hash cache next to the manifest for the next incremental build."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with cache_path.open("w", encoding="utf-8") as f:
+        json.dump({"payload_dir": os.path.abspath(payload_dir), "files": cache}, f, ensure_ascii=False)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_private_key_cached(pem_path: str, mtime_ns: int):
+    with open(pem_path, "rb") as f:
         return serialization.load_pem_private_key(f.read(), password=None)
 
 
-def write_manifest(output: Path, manifest: dict):
-    """Write the manifest JSON to disk with UTF-8 encoding."""
+def load_private_key(private_key: Path):
+    """
+    Load a PEM-encoded RSA or Ed25519 private key for signing.
+
+    Parsed keys are cached per path and modification time, so signing several
+    manifests in one process parses the PEM only once.
+    """
+    pem_path = os.path.abspath(private_key)
+    return _load_private_key_cached(pem_path, os.stat(pem_path).st_mtime_ns)
+
+
+def sign_manifest(private_key, manifest_bytes: bytes) -> bytes:
+    """Sign canonical manifest bytes with Ed25519 or RSA PKCS#1 v1.5 (SHA-256), depending on the key type."""
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return private_key.sign(manifest_bytes)
+    return private_key.sign(
+        manifest_bytes,
+        padding.PKCS1v15(),
+        hashes.SHA256(),
+    )
+
+
+def write_manifest(output: Path, manifest_bytes: bytes, signature: bytes):
+    """
+    Write the signed manifest JSON to disk with UTF-8 encoding.
+
+    The signature is spliced into the already encoded canonical bytes instead
+    of serializing the (potentially large) file list a second time.
+    """
+    encoded_signature = base64.b64encode(signature)
     output.parent.mkdir(parents=True, exist_ok=True)
-    with output.open("w", encoding="utf-8") as f:
-        json.dump(manifest, f, indent=4, ensure_ascii=False)
+    output.write_bytes(manifest_bytes[:-1] + b',"signature":"' + encoded_signature + b'"}')
 
 
 def main():
@@ -80,7 +192,7 @@ def main():
         "--private-key",
         type=Path,
         default=Path(__file__).with_name("private.pem"),
-        help="PEM-encoded RSA private key used for signing",
+        help="PEM-encoded RSA or Ed25519 private key used for signing",
     )
     parser.add_argument(
         "--output",
@@ -88,23 +200,32 @@ def main():
         default=Path("manifest.json"),
         help="Where to write manifest.json (default: working directory)",
     )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        help="Optional hash cache (e.g. manifest.cache.json) to skip rehashing unchanged files; "
+        "must be outside the payload folder",
+    )
 
     args = parser.parse_args()
 
-    files = collect_hashes(args.payload_dir)
+    # A cache inside the payload would be hashed with its previous content and then rewritten,
+    # leaving a wrong hash in the signed manifest.
+    if args.cache and args.cache.resolve().is_relative_to(args.payload_dir.resolve()):
+        parser.error("--cache must not point into --payload-dir")
+
+    cache = load_hash_cache(args.cache, args.payload_dir) if args.cache else None
+    files = collect_hashes(args.payload_dir, cache)
+    if args.cache:
+        save_hash_cache(args.cache, args.payload_dir, cache)
 
     unsigned_manifest = {"version": args.version, "files": files}
     manifest_bytes = canonical_json(unsigned_manifest)
 
     private_key = load_private_key(args.private_key)
-    signature = private_key.sign(
-        manifest_bytes,
-        padding.PKCS1v15(),
-        hashes.SHA256(),
-    )
+    signature = sign_manifest(private_key, manifest_bytes)
 
-    manifest = unsigned_manifest | {"signature": base64.b64encode(signature).decode()}
-    write_manifest(args.output, manifest)
+    write_manifest(args.output, manifest_bytes, signature)
 
     print(f"Manifest created at: {args.output}")
 
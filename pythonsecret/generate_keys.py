@@ -1,11 +1,28 @@
-from cryptography.hazmat.primitives.asymmetric import rsa
+import argparse
+
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
 from cryptography.hazmat.primitives import serialization
 
-# Privater Schlüssel
-private_key = rsa.generate_private_key(
-    public_exponent=65537,
-    key_size=2048
+parser = argparse.ArgumentParser(description="Erzeugt private.pem und public.pem")
+parser.add_argument(
+    "--algorithm",
+    choices=("rsa", "ed25519"),
+    default="rsa",
+    help="Schlüsseltyp (Default: rsa, der WPF-Launcher prüft nur RSA-Signaturen)",
 )
+args = parser.parse_args()
+
+# Privater Schlüssel
+if args.algorithm == "ed25519":
+    private_key = ed25519.Ed25519PrivateKey.generate()
+else:
+    private_key = rsa.generate_private_key(
+        public_exponent=65537,
+        key_size=2048
+    )
+    # CRT-Parameter (dp, dq, qinv) müssen erhalten bleiben, sonst signiert RSA ~4x langsamer
+    numbers = private_key.private_numbers()
+    assert numbers.dmp1 and numbers.dmq1 and numbers.iqmp, "RSA-Schlüssel ohne CRT-Parameter"
 
 with open("private.pem", "wb") as f:
     f.write(private_key.private_bytes(
@@ -23,4 +40,4 @@ with open("public.pem", "wb") as f:
         format=serialization.PublicFormat.SubjectPublicKeyInfo
     ))
 
-print("RSA Schlüssel erzeugt.")
+print(f"{args.algorithm.upper()} Schlüssel erzeugt.")
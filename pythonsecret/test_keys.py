@@ -1,4 +1,4 @@
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import ed25519, padding, rsa
 from cryptography.hazmat.primitives import hashes, serialization
 
 
@@ -16,6 +16,12 @@ def load_public_key():
         return serialization.load_pem_public_key(f.read())
 
 
+def check_crt_parameters(priv):
+    """Return True if the RSA key carries its CRT parameters (dp, dq, qinv)."""
+    numbers = priv.private_numbers()
+    return bool(numbers.dmp1 and numbers.dmq1 and numbers.iqmp)
+
+
 def main():
     message = b"test-message-123"
 
@@ -23,21 +29,34 @@ def main():
     priv = load_private_key()
     pub = load_public_key()
 
-    print("Signiere Test-Nachricht...")
-    sig = priv.sign(
-        message,
-        padding.PKCS1v15(),
-        hashes.SHA256()
-    )
+    if isinstance(priv, rsa.RSAPrivateKey):
+        print("Prüfe CRT-Parameter...")
+        if check_crt_parameters(priv):
+            print("✔ CRT-Parameter vorhanden.")
+        else:
+            print("❌ CRT-Parameter fehlen, Signieren ist deutlich langsamer!")
 
-    print("Verifiziere Signatur mit Public Key...")
-    try:
-        pub.verify(
-            sig,
+    print("Signiere Test-Nachricht...")
+    if isinstance(priv, ed25519.Ed25519PrivateKey):
+        sig = priv.sign(message)
+    else:
+        sig = priv.sign(
             message,
             padding.PKCS1v15(),
             hashes.SHA256()
         )
+
+    print("Verifiziere Signatur mit Public Key...")
+    try:
+        if isinstance(pub, ed25519.Ed25519PublicKey):
+            pub.verify(sig, message)
+        else:
+            pub.verify(
+                sig,
+                message,
+                padding.PKCS1v15(),
+                hashes.SHA256()
+            )
         print("✔ Schlüssel passen zueinander (Public/Private korrekt).")
     except Exception as e:
         print("❌ Schlüssel passen NICHT zueinander!")
@@ -3,9 +3,10 @@ Validate a signed update payload consisting of a ZIP archive and a manifest.json
 
 The script performs three checks:
 1. Validate the manifest structure (version, files map, signature field).
-2. Verify the RSA signature using the provided public key.
-3. Extract the ZIP in-memory and compare SHA-256 hashes for every file listed
-   in the manifest (optionally erroring on extra files in the archive).
+2. Verify the RSA or Ed25519 signature using the provided public key.
+3. Stream the ZIP members listed in the manifest and compare their SHA-256
+   hashes, stopping at the first mismatch. Extra files in the archive are
+   detected by name only (optionally erroring on them) and never hashed.
 Example:
     python validate_payload.py --zip update.zip --manifest manifest.json \\
         --public-key public.pem --fail-on-extra
@@ -13,23 +14,45 @@ Example:
 
 import argparse
 import base64
+import functools
 import hashlib
+import hmac
 import json
 import locale
+import os
+import re
+import struct
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from pathlib import Path
-from typing import Dict, Optional
+from typing import AbstractSet, Dict, Iterable, Iterator, Optional
 import zipfile
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib encoder produces the same bytes
+    orjson = None
+
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric import ed25519, padding
+
+HASH_CHUNK_SIZE = 1 << 20  # 1 MiB per read keeps the per-call overhead negligible
+LOCAL_FILE_HEADER = struct.Struct("<4s2B4HL2L2H")  # same layout as zipfile.structFileHeader
+STORED_FAST_PATH_MIN_SIZE = 1 << 18  # below this, the extra file handle costs more than ZipExtFile
+SLASH_TRANSLATION = str.maketrans("\\", "/")
+MANIFEST_SHA256_HEX = re.compile(r"[0-9a-fA-F]{64}")  # exactly 64 hex digits, either case
+stored_member_buffers = threading.local()  # one HASH_CHUNK_SIZE read buffer per hashing thread
 
 def canonical_json(obj) -> bytes:
     """
     Produce canonical JSON bytes matching the format used by the launchers and
     manifest creation script (sorted keys, no whitespace, UTF-8).
     """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
     return json.dumps(
         obj,
         sort_keys=True,
@@ -37,11 +60,15 @@ def canonical_json(obj) -> bytes:
         ensure_ascii=False,
     ).encode("utf-8")
 
+@functools.lru_cache(maxsize=1)
 def enforce_german_locale() -> Optional[str]:
     """
     Force locale-sensitive validation steps to use a German locale, even on
     systems configured for a different language. Returns the locale string that
     could be activated or None if no German locale is available.
+
+    The validation itself does not depend on the locale (messages are German
+    literals), so this only runs on request and at most once per process.
     """
     german_candidates = (
         "de_DE.UTF-8",  # Linux common
@@ -67,16 +94,30 @@ def normalize_relative_path(path: str) -> str:
     - drop "." segments and empty parts
     - reject ".." segments
     """
-    posix = path.replace("\\", "/")
-    parts = []
-    for part in posix.split("/"):
-        if part in ("", "."):
-            continue
-        if part == "..":
-            raise ValueError("Manifest enthält unzulässigen Pfadanteil '..'.")
-        parts.append(part)
+    parts = [part for part in path.translate(SLASH_TRANSLATION).split("/") if part and part != "."]
+    if ".." in parts:
+        raise ValueError("Manifest enthält unzulässigen Pfadanteil '..'.")
     return "/".join(parts)
 
+def normalize_many(paths: Iterable[str]) -> list[str]:
+    """
+    Normalize a batch of relative paths like normalize_relative_path. Paths that
+    are already normalized (no backslash, no empty, "." or ".." segment) are
+    detected with a few substring checks and returned as-is.
+    """
+    normalized: list[str] = []
+    append = normalized.append
+    normalize = normalize_relative_path
+
+    for path in paths:
+        wrapped = f"/{path}/"
+        if "\\" in path or "//" in wrapped or "/./" in wrapped or "/../" in wrapped:
+            append(normalize(path))
+        else:
+            append(path)
+
+    return normalized
+
 def load_manifest(manifest_path: Path) -> tuple[str, Dict[str, str], bytes]:
     """Load and validate manifest.json fields."""
     data = json.loads(manifest_path.read_text(encoding="utf-8"))
@@ -104,17 +145,35 @@ def load_manifest(manifest_path: Path) -> tuple[str, Dict[str, str], bytes]:
 
     return data["version"], files, signature
 
-def load_public_key(public_key_path: Path):
-    """Load an RSA public key from PEM."""
-    with public_key_path.open("rb") as fh:
+@functools.lru_cache(maxsize=4)
+def _load_public_key_cached(pem_path: str, mtime_ns: int):
+    with open(pem_path, "rb") as fh:
         return serialization.load_pem_public_key(fh.read())
 
+def load_public_key(public_key_path: Path):
+    """
+    Load an RSA or Ed25519 public key from PEM. Parsed keys are cached per path
+    and modification time, so validating several payloads parses it only once.
+    """
+    pem_path = os.path.abspath(public_key_path)
+    return _load_public_key_cached(pem_path, os.stat(pem_path).st_mtime_ns)
+
 def verify_signature(version: str, files: Dict[str, str], signature: bytes, public_key_path: Path) -> None:
-    """Verify RSA PKCS#1 v1.5 signature for the unsigned manifest payload."""
+    """
+    Verify the signature for the unsigned manifest payload. The algorithm is
+    chosen by the key type: Ed25519, otherwise RSA PKCS#1 v1.5 with SHA-256.
+    RSA stays on PKCS#1 v1.5 because the WPF launcher verifies with
+    RSASignaturePadding.Pkcs1, so PSS would break it. Prehashing gains nothing:
+    cryptography already hashes the payload before the RSA operation.
+    """
     unsigned_manifest = {"version": version, "files": files}
     payload = canonical_json(unsigned_manifest)
     public_key = load_public_key(public_key_path)
 
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        public_key.verify(signature, payload)
+        return
+
     public_key.verify(
         signature,
         payload,
@@ -122,29 +181,115 @@ def verify_signature(version: str, files: Dict[str, str], signature: bytes, publ
         hashes.SHA256(),
     )
 
-def hash_zip_members(zip_path: Path) -> Dict[str, str]:
+def index_zip_members(
+    archive: zipfile.ZipFile, manifest_names: AbstractSet[str]
+) -> tuple[Dict[str, zipfile.ZipInfo], list[str]]:
     """
-    Return a map of normalized archive paths -> sha256 hex digests.
+    Return a map of normalized archive paths -> ZipInfo entries for members
+    listed in the manifest, plus the sorted names of all other members.
+    Extra members are decided by name alone, so their content is never read.
     Directory entries are ignored.
     """
-    hashes: Dict[str, str] = {}
+    members: Dict[str, zipfile.ZipInfo] = {}
+    extra_files: set[str] = set()
 
-    with zipfile.ZipFile(zip_path, "r") as archive:
-        for info in archive.infolist():
-            if info.is_dir():
-                continue
+    infos = [info for info in archive.infolist() if not info.is_dir()]
+    for info, normalized in zip(infos, normalize_many([info.filename for info in infos])):
+        if normalized in members or normalized in extra_files:
+            raise ValueError(f"Doppelte Datei im ZIP: {normalized}")
 
-            normalized = normalize_relative_path(info.filename)
-            if normalized in hashes:
-                raise ValueError(f"Doppelte Datei im ZIP: {normalized}")
+        if normalized in manifest_names:
+            members[normalized] = info
+        else:
+            extra_files.add(normalized)
 
-            digest = hashlib.sha256()
-            with archive.open(info, "r") as file_handle:
-                for chunk in iter(lambda: file_handle.read(8192), b""):
-                    digest.update(chunk)
-            hashes[normalized] = digest.hexdigest()
+    return members, sorted(extra_files)
 
-    return hashes
+def hash_stored_member(zip_path: str, info: zipfile.ZipInfo) -> bytes:
+    """
+    Hash a STORED (uncompressed) member straight from its byte range in the
+    archive, bypassing ZipExtFile and its CRC-32 bookkeeping. The member is read
+    through its own file handle into a buffer reused per thread. Like
+    ZipFile.open, the local header name must match the central directory.
+    """
+    digest = hashlib.sha256()
+    buffer = getattr(stored_member_buffers, "buffer", None)
+    if buffer is None:
+        buffer = stored_member_buffers.buffer = memoryview(bytearray(HASH_CHUNK_SIZE))
+
+    with open(zip_path, "rb") as fh:
+        fh.seek(info.header_offset)
+        header = fh.read(LOCAL_FILE_HEADER.size)
+        if len(header) != LOCAL_FILE_HEADER.size:
+            raise zipfile.BadZipFile(f"Abgeschnittener Datei-Header im ZIP: {info.filename}")
+        fields = LOCAL_FILE_HEADER.unpack(header)
+        if fields[0] != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile(f"Ungültiger Datei-Header im ZIP: {info.filename}")
+        name_encoding = "utf-8" if info.flag_bits & 0x800 else "cp437"
+        if fh.read(fields[10]) != info.orig_filename.encode(name_encoding):
+            raise zipfile.BadZipFile(f"Dateiname im Datei-Header weicht ab: {info.filename}")
+        fh.seek(fields[11], 1)  # skip extra field
+
+        remaining = info.compress_size
+        while remaining:
+            read = fh.readinto(buffer[:min(remaining, HASH_CHUNK_SIZE)])
+            if not read:
+                raise zipfile.BadZipFile(f"Abgeschnittene Datei im ZIP: {info.filename}")
+            digest.update(buffer[:read])
+            remaining -= read
+
+    return digest.digest()
+
+def hash_zip_member(
+    archive: zipfile.ZipFile, info: zipfile.ZipInfo, open_lock: threading.Lock, stored_fast_path: bool = True
+) -> bytes:
+    """
+    Stream a single archive member through SHA-256 and return the raw digest.
+    Reads on a shared ZipFile are synchronized by zipfile itself, but opening and
+    closing members updates an unguarded reference count, so both happen under
+    open_lock. Large unencrypted STORED members take the hash_stored_member fast
+    path, which skips the CRC-32 check; pass stored_fast_path=False when there is
+    no expected hash to catch corrupted data.
+    """
+    if (
+        stored_fast_path
+        and info.compress_type == zipfile.ZIP_STORED
+        and info.compress_size >= STORED_FAST_PATH_MIN_SIZE
+        and not info.flag_bits & 0x1
+        and archive.filename
+    ):
+        return hash_stored_member(archive.filename, info)
+
+    digest = hashlib.sha256()
+    update = digest.update
+    with open_lock:
+        file_handle = archive.open(info, "r")
+    try:
+        read = file_handle.read
+        while chunk := read(HASH_CHUNK_SIZE):
+            update(chunk)
+    finally:
+        with open_lock:
+            file_handle.close()
+    return digest.digest()
+
+def hash_zip_members(
+    archive: zipfile.ZipFile, infos: Iterable[zipfile.ZipInfo], stored_fast_path: bool = True
+) -> Iterator[bytes]:
+    """
+    Hash archive members on a thread pool and yield their raw digests in input
+    order. zlib inflate and SHA-256 release the GIL, so members are processed in
+    parallel. Pending members are cancelled once the caller stops iterating.
+    stored_fast_path is passed through to hash_zip_member.
+    """
+    open_lock = threading.Lock()
+    executor = ThreadPoolExecutor()
+    try:
+        yield from executor.map(
+            lambda info: hash_zip_member(archive, info, open_lock, stored_fast_path), infos
+        )
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
 
 def validate_payload(zip_path: Path, manifest_path: Path, public_key_path: Path, fail_on_extra: bool) -> None:
     version, files, signature = load_manifest(manifest_path)
@@ -154,31 +299,31 @@ def validate_payload(zip_path: Path, manifest_path: Path, public_key_path: Path,
     except InvalidSignature as exc:
         raise ValueError("Signaturprüfung fehlgeschlagen.") from exc
 
-    archive_hashes = hash_zip_members(zip_path)
+    # Expected hashes are decoded once so members are compared as raw 32-byte digests.
+    # bytes.fromhex tolerates whitespace, so the exact 64-hex-digit form is checked first.
+    if not all(MANIFEST_SHA256_HEX.fullmatch(expected_hash) for expected_hash in files.values()):
+        raise ValueError("Manifest enthält ungültige SHA-256-Hashwerte.")
+    expected_digests = [bytes.fromhex(expected_hash) for expected_hash in files.values()]
+    normalized_manifest_files: Dict[str, bytes] = dict(zip(normalize_many(files), expected_digests))
 
-    normalized_manifest_files: Dict[str, str] = {}
-    for rel_path, expected_hash in files.items():
-        normalized = normalize_relative_path(rel_path)
-        normalized_manifest_files[normalized] = expected_hash.lower()
-
-    missing = []
-    hash_mismatches = []
-    for rel_path, expected_hash in normalized_manifest_files.items():
-        if rel_path not in archive_hashes:
-            missing.append(rel_path)
-            continue
+    with zipfile.ZipFile(zip_path, "r") as archive:
+        manifest_keys = normalized_manifest_files.keys()
+        members, extra_files = index_zip_members(archive, manifest_keys)
 
-        if archive_hashes[rel_path].lower() != expected_hash:
-            hash_mismatches.append(rel_path)
+        # Set operation on the key views avoids copying either key set.
+        missing = sorted(manifest_keys - members.keys())
 
-    extra_files = sorted(set(archive_hashes) - set(normalized_manifest_files))
+        if missing:
+            raise ValueError(f"Dateien fehlen im ZIP: {', '.join(missing)}")
+        if fail_on_extra and extra_files:
+            raise ValueError(f"ZIP enthält nicht im Manifest gelistete Dateien: {', '.join(extra_files)}")
 
-    if missing:
-        raise ValueError(f"Dateien fehlen im ZIP: {', '.join(missing)}")
-    if hash_mismatches:
-        raise ValueError(f"Hashes stimmen nicht: {', '.join(hash_mismatches)}")
-    if fail_on_extra and extra_files:
-        raise ValueError(f"ZIP enthält nicht im Manifest gelistete Dateien: {', '.join(extra_files)}")
+        # Only manifest entries are hashed; the first mismatch aborts the check.
+        rel_paths = list(normalized_manifest_files)
+        with closing(hash_zip_members(archive, (members[rel_path] for rel_path in rel_paths))) as digests:
+            for rel_path, digest in zip(rel_paths, digests):
+                if not hmac.compare_digest(digest, normalized_manifest_files[rel_path]):
+                    raise ValueError(f"Hashes stimmen nicht: {rel_path}")
 
     if extra_files:
         print(f"Warnung: Zusätzliche Dateien im ZIP (nicht im Manifest): {', '.join(extra_files)}")
@@ -200,14 +345,20 @@ def main() -> None:
         action="store_true",
         help="Fehlschlag, falls das ZIP zusätzliche Dateien enthält, die nicht im Manifest stehen.",
     )
+    parser.add_argument(
+        "--german-locale",
+        action="store_true",
+        help="Deutsche Locale für die Validierung setzen (Meldungen sind unabhängig davon deutsch).",
+    )
 
     args = parser.parse_args()
 
-    german_locale = enforce_german_locale()
-    if german_locale:
-        print(f"Locale für Validierung gesetzt auf: {german_locale}", file=sys.stderr)
-    else:
-        print("Warnung: Keine deutsche Locale verfügbar, es wird die System-Locale verwendet.", file=sys.stderr)
+    if args.german_locale:
+        german_locale = enforce_german_locale()
+        if german_locale:
+            print(f"Locale für Validierung gesetzt auf: {german_locale}", file=sys.stderr)
+        else:
+            print("Warnung: Keine deutsche Locale verfügbar, es wird die System-Locale verwendet.", file=sys.stderr)
 
     try:
         validate_payload(args.zip, args.manifest, args.public_key, args.fail_on_extra)
@@ -8,7 +8,16 @@ class Handler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=DIRECTORY, **kwargs)
 
+    def copyfile(self, source, outputfile):
+        # socket.sendfile nutzt os.sendfile (Zero-Copy) und fällt für
+        # Nicht-Dateien wie Verzeichnislisten selbst auf send() zurück.
+        self.connection.sendfile(source)
+
+class Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
 print(f"Starte Update-Server auf Port {PORT}...")
-with socketserver.TCPServer(("", PORT), Handler) as httpd:
+with Server(("", PORT), Handler) as httpd:
     print("Server läuft. Drücke STRG+C zum Beenden.")
     httpd.serve_forever()